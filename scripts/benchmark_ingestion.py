@@ -0,0 +1,95 @@
+"""Benchmark chunked OneStop ingestion with and without fused quality checks."""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.onestop_loader import OneStopLoader
+
+
+def write_synthetic_report(path: Path, n_rows: int, extra_columns: int = 0, seed: int = 0):
+    """Write a synthetic fixation report with EyeLink-style columns."""
+    rng = np.random.default_rng(seed)
+    trial = np.arange(n_rows) // 200
+    duration = rng.integers(80, 400, n_rows)
+    start = np.cumsum(duration + rng.integers(10, 60, n_rows))
+    x = rng.normal(900, 400, n_rows).round(1)
+    x[rng.random(n_rows) < 0.01] = np.nan
+    report = pd.DataFrame({
+        # OneStop uses string ids for participants and paragraphs
+        "participant_id": np.char.add("l", (trial // 50).astype(str)),
+        "unique_paragraph_id": np.char.add("3_1_Adv_", (trial % 50).astype(str)),
+        "CURRENT_FIX_INDEX": np.arange(n_rows) % 200 + 1,
+        "CURRENT_FIX_X": x,
+        "CURRENT_FIX_Y": rng.normal(500, 200, n_rows).round(1),
+        "CURRENT_FIX_DURATION": duration,
+        "CURRENT_FIX_START": start - duration,
+        "CURRENT_FIX_END": start,
+    })
+    # Real reports carry many more columns (pupil, saccade, IA and text fields)
+    for i in range(extra_columns):
+        report[f"EXTRA_{i}"] = rng.normal(0, 1, n_rows).round(3)
+    report.to_csv(path, index=False, na_rep=".")
+
+
+def time_ingestion(path: Path, repeats: int):
+    """
+    Return the best wall-clock times (without, with) quality checks.
+
+    Runs alternate between the two configurations so machine noise and
+    page-cache drift affect both equally. With checks enabled the fixation
+    start column is parsed as well, which ingestion otherwise skips.
+    """
+    loaders = {
+        checks: OneStopLoader(output_folder=str(path.parent), quality_checks=checks)
+        for checks in (False, True)
+    }
+    best = {False: float("inf"), True: float("inf")}
+    for _ in range(repeats):
+        for checks, loader in loaders.items():
+            t0 = time.perf_counter()
+            loader.ingest_fixations(path)
+            best[checks] = min(best[checks], time.perf_counter() - t0)
+    return best[False], best[True]
+
+
+def benchmark(rows: int, extra_columns: int, repeats: int) -> float:
+    """Print throughput with and without checks and return the overhead in percent."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "fixations_Paragraph.csv"
+        write_synthetic_report(path, rows, extra_columns)
+
+        baseline, checked = time_ingestion(path, repeats)
+
+    overhead = (checked - baseline) / baseline * 100
+    label = f"[{8 + extra_columns} columns]"
+    print(f"{label} without checks: {rows / baseline:,.0f} rows/s ({baseline:.2f}s)")
+    print(f"{label} with checks:    {rows / checked:,.0f} rows/s ({checked:.2f}s)")
+    print(f"{label} overhead: {overhead:.1f}% ({'OK' if overhead < 5 else 'ABOVE'} 5% budget)")
+    return overhead
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark ingestion quality-check overhead")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic fixation rows")
+    parser.add_argument("--extra-columns", type=int, default=30,
+                        help="Additional numeric columns for the wide run (real reports are wide)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per configuration")
+    args = parser.parse_args()
+
+    # Narrow file: parsing is cheapest, so this is the worst case for the checks
+    benchmark(args.rows, 0, args.repeats)
+    benchmark(args.rows, args.extra_columns, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Participant-grouped k-fold cross-validation for eye-tracking models."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.training.cross_validation import run_cross_validation
+from src.utils.logger import setup_logger
+
+
+def load_config(config_path: str) -> dict:
+    """Load configuration from YAML file."""
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Cross-validate eye-tracking model")
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="configs/config.yaml",
+        help="Path to configuration file"
+    )
+    parser.add_argument("--features", type=str, required=True, help="Features .npy file")
+    parser.add_argument("--labels", type=str, required=True, help="Labels .npy file")
+    parser.add_argument("--groups", type=str, required=True, help="Participant ids .npy file")
+    args = parser.parse_args()
+
+    # Load configuration
+    config = load_config(args.config)
+    cv_config = config.get('cross_validation', {})
+    setup_logger("training")
+
+    # Run cross-validation
+    results = run_cross_validation(
+        config,
+        features_path=args.features,
+        labels_path=args.labels,
+        groups_path=args.groups,
+        output_dir=cv_config.get('output_dir', "models/cv"),
+        n_splits=cv_config.get('n_splits', 5),
+        n_jobs=cv_config.get('n_jobs'),
+        confidence=cv_config.get('confidence', 0.95),
+        seed=cv_config.get('seed', 0),
+    )
+
+    summary_path = Path(results["ensemble_path"]).parent / "cv_summary.json"
+    with open(summary_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Download and preprocess datasets using the project configuration."""
+
+import argparse
+import sys
+from pathlib import Path
+
+import yaml
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data import DATASET_LOADERS
+from src.utils.resources import ResourceMonitor
+
+
+def load_config(config_path: str) -> dict:
+    """Load configuration from YAML file."""
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Download and preprocess datasets")
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="configs/config.yaml",
+        help="Path to configuration file"
+    )
+    parser.add_argument(
+        "--dataset",
+        choices=sorted(DATASET_LOADERS),
+        default="onestop",
+        help="Dataset to process"
+    )
+    args = parser.parse_args()
+
+    # Load configuration
+    config = load_config(args.config)
+
+    # Run pipeline with the configured quality checks; the monitor records the
+    # download/preprocess stages and drives adaptive chunk sizes under the budget
+    with ResourceMonitor.from_config(config, name=args.dataset) as monitor:
+        loader = DATASET_LOADERS[args.dataset].from_config(config, monitor=monitor)
+        loader.run_full_pipeline()
+
+    monitor.log_summary()
+    report_dir = Path(config.get('resources', {}).get('report_dir', 'logs'))
+    monitor.save_report(report_dir / f'{args.dataset}_resources.json')
+
+
+if __name__ == "__main__":
+    main()
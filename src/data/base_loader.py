@@ -4,6 +4,7 @@ import zipfile
 from pathlib import Path
 import requests
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 
 class BaseDatasetLoader(ABC):
     """
@@ -11,9 +12,10 @@ class BaseDatasetLoader(ABC):
     Each dataset subclass should implement its own URLs and preprocessing steps.
     """
 
-    def __init__(self, output_folder: str = "data/raw", extract: bool = True):
+    def __init__(self, output_folder: str = "data/raw", extract: bool = True, monitor=None):
         self.output_folder = Path(output_folder)
         self.extract = extract
+        self.monitor = monitor  # optional ResourceMonitor for per-stage accounting
         self.output_folder.mkdir(parents=True, exist_ok=True)
 
     # ------------------------------------------------------
@@ -59,9 +61,15 @@ class BaseDatasetLoader(ABC):
     # ------------------------------------------------------
     # 🧩 Step 3: Utility
     # ------------------------------------------------------
+    def _stage(self, name: str):
+        """Resource-accounting context for a pipeline stage (no-op without a monitor)."""
+        return self.monitor.stage(name) if self.monitor is not None else nullcontext()
+
     def run_full_pipeline(self):
         """Run download → preprocess → ready-for-model pipeline."""
         print(f"[PIPELINE] Starting pipeline for {self.__class__.__name__}")
-        self.download()
-        self.preprocess()
+        with self._stage("download"):
+            self.download()
+        with self._stage("preprocess"):
+            self.preprocess()
         print(f"[PIPELINE] Completed pipeline for {self.__class__.__name__}")
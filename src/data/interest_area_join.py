@@ -0,0 +1,326 @@
+"""Vectorized join of fixations to interest areas and word-level reading measures.
+
+OneStop ships fixation reports (``fixations_Paragraph``) and interest-area
+reports (``ia_Paragraph``) as separate tables. This module maps every fixation
+onto the word box it landed in using sorted interval indexes and
+``np.searchsorted``, then derives the classic word-level reading measures
+without any per-row Python loops:
+
+    - first_fixation_duration → first fixation on the word during first pass
+    - gaze_duration           → sum of the first-pass run on the word
+    - total_reading_time      → sum of all fixations on the word
+    - skipped                 → word not fixated during first pass
+                                (its mean over participants is the skip rate)
+    - regressions_in/out      → regressive saccades landing on / leaving the word
+
+Work is partitioned by participant and spread across processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Column names used in the OneStop fixation / interest-area reports.
+DEFAULT_COLUMNS: Dict[str, str] = {
+    "participant": "participant_id",
+    "paragraph": "unique_paragraph_id",
+    "fix_index": "CURRENT_FIX_INDEX",
+    "fix_x": "CURRENT_FIX_X",
+    "fix_y": "CURRENT_FIX_Y",
+    "fix_duration": "CURRENT_FIX_DURATION",
+    "ia_id": "IA_ID",
+    "ia_left": "IA_LEFT",
+    "ia_right": "IA_RIGHT",
+    "ia_top": "IA_TOP",
+    "ia_bottom": "IA_BOTTOM",
+}
+
+MEASURE_COLUMNS: List[str] = [
+    "first_fixation_duration",
+    "gaze_duration",
+    "total_reading_time",
+    "fixation_count",
+    "skipped",
+    "regressions_in",
+    "regressions_out",
+]
+
+
+def _resolve_columns(columns: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Merge user overrides into the default column mapping."""
+    resolved = dict(DEFAULT_COLUMNS)
+    if columns:
+        resolved.update(columns)
+    return resolved
+
+
+def _group_codes(fixations: pd.DataFrame, interest_areas: pd.DataFrame, keys: List[str]):
+    """Factorize paragraph keys jointly so both tables share the same integer codes."""
+    stacked = pd.concat([fixations[keys], interest_areas[keys]], ignore_index=True)
+    codes, _ = pd.MultiIndex.from_frame(stacked).factorize()
+    codes = codes.astype(np.int64)
+    return codes[: len(fixations)], codes[len(fixations):]
+
+
+def map_fixations_to_interest_areas(
+    fixations: pd.DataFrame,
+    interest_areas: pd.DataFrame,
+    columns: Optional[Dict[str, str]] = None,
+    group_by: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """
+    Assign each fixation to the interest area (word box) it falls into.
+
+    Interest areas are sorted into one global interval index ordered by
+    (paragraph, line, left edge), where a line is a run of boxes with
+    overlapping vertical extents. Paragraph and line offsets are folded
+    into the search keys, so a single ``np.searchsorted`` call locates the
+    line of every fixation and a second one locates the word on that line.
+
+    Args:
+        fixations: Fixation report with x/y coordinates
+        interest_areas: Interest-area report with box edges and IA ids
+        columns: Optional overrides for ``DEFAULT_COLUMNS``
+        group_by: Columns identifying a paragraph layout
+            (defaults to participant + paragraph)
+
+    Returns:
+        Integer array of IA ids aligned with ``fixations`` (-1 when unmapped)
+    """
+    cols = _resolve_columns(columns)
+    keys = list(group_by) if group_by is not None else [cols["participant"], cols["paragraph"]]
+
+    result = np.full(len(fixations), -1, dtype=np.int64)
+    if len(fixations) == 0 or len(interest_areas) == 0:
+        return result
+
+    fix_group, ia_group = _group_codes(fixations, interest_areas, keys)
+
+    fix_x = fixations[cols["fix_x"]].to_numpy(dtype=np.float64)
+    fix_y = fixations[cols["fix_y"]].to_numpy(dtype=np.float64)
+    left = interest_areas[cols["ia_left"]].to_numpy(dtype=np.float64)
+    right = interest_areas[cols["ia_right"]].to_numpy(dtype=np.float64)
+    top = interest_areas[cols["ia_top"]].to_numpy(dtype=np.float64)
+    bottom = interest_areas[cols["ia_bottom"]].to_numpy(dtype=np.float64)
+    ia_ids = interest_areas[cols["ia_id"]].to_numpy(dtype=np.int64)
+
+    # Shift coordinates to be non-negative so paragraph/line offsets never collide.
+    valid = np.isfinite(fix_x) & np.isfinite(fix_y)
+    x_min = min(left.min(), fix_x[valid].min() if valid.any() else left.min())
+    y_min = min(top.min(), fix_y[valid].min() if valid.any() else top.min())
+    x_max = max(right.max(), fix_x[valid].max() if valid.any() else right.max())
+    y_max = max(bottom.max(), fix_y[valid].max() if valid.any() else bottom.max())
+    x_span = x_max - x_min + 1.0
+    y_span = y_max - y_min + 1.0
+
+    order = np.lexsort((left, top, ia_group))
+    ia_group, left, right = ia_group[order], left[order], right[order]
+    top, bottom, ia_ids = top[order], bottom[order], ia_ids[order]
+
+    # Lines: boxes whose vertical [top, bottom) intervals overlap belong to the
+    # same line, so slightly ragged tops on one visual line do not split it.
+    # A new line starts where a box's top clears every bottom seen so far.
+    bottom_so_far = _segment_cummax(bottom, ia_group)
+    new_line = np.ones(len(order), dtype=bool)
+    new_line[1:] = (ia_group[1:] != ia_group[:-1]) | (top[1:] >= bottom_so_far[:-1])
+    ia_line = np.cumsum(new_line) - 1
+    line_starts = np.flatnonzero(new_line)
+    line_group = ia_group[line_starts]
+    line_top = top[line_starts]
+    line_bottom = np.maximum.reduceat(bottom, line_starts)
+
+    # Within a merged line the boxes are re-sorted by left edge.
+    order = np.lexsort((left, ia_line))
+    ia_line, left, right, ia_ids = ia_line[order], left[order], right[order], ia_ids[order]
+    line_keys = line_group * y_span + (line_top - y_min)
+
+    fix_line_keys = fix_group * y_span + (np.nan_to_num(fix_y, nan=y_min) - y_min)
+    line_pos = np.searchsorted(line_keys, fix_line_keys, side="right") - 1
+    safe_line = np.clip(line_pos, 0, None)
+    on_line = (
+        valid
+        & (line_pos >= 0)
+        & (line_group[safe_line] == fix_group)
+        & (fix_y < line_bottom[safe_line])
+    )
+
+    # Word index within the line.
+    word_keys = ia_line * x_span + (left - x_min)
+    fix_word_keys = safe_line * x_span + (np.nan_to_num(fix_x, nan=x_min) - x_min)
+    word_pos = np.searchsorted(word_keys, fix_word_keys, side="right") - 1
+    safe_word = np.clip(word_pos, 0, None)
+    in_box = (
+        on_line
+        & (word_pos >= 0)
+        & (ia_line[safe_word] == safe_line)
+        & (fix_x < right[safe_word])
+    )
+
+    result[in_box] = ia_ids[safe_word[in_box]]
+    return result
+
+
+def _segment_cummax(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Running maximum of ``values`` that restarts whenever ``groups`` changes (groups sorted)."""
+    if len(values) == 0:
+        return values.copy()
+    offset = values.max() - values.min() + 1
+    shifted = values - values.min() + groups * offset
+    return np.maximum.accumulate(shifted) - groups * offset + values.min()
+
+
+def compute_reading_measures(
+    fixations: pd.DataFrame,
+    interest_areas: pd.DataFrame,
+    columns: Optional[Dict[str, str]] = None,
+    group_by: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Compute word-level reading measures for every interest area.
+
+    Fixations are ordered by trial and fixation index; first-pass fixations
+    are those of the first run on a word that started before any word to its
+    right had been fixated. All aggregation uses ``np.bincount`` over a
+    combined (paragraph, word) key.
+
+    Args:
+        fixations: Fixation report
+        interest_areas: Interest-area report
+        columns: Optional overrides for ``DEFAULT_COLUMNS``
+        group_by: Columns identifying a trial (defaults to participant + paragraph)
+
+    Returns:
+        One row per interest area with the grouping columns, IA id and
+        the measures listed in ``MEASURE_COLUMNS``
+    """
+    cols = _resolve_columns(columns)
+    keys = list(group_by) if group_by is not None else [cols["participant"], cols["paragraph"]]
+
+    words = interest_areas[keys + [cols["ia_id"]]].drop_duplicates().reset_index(drop=True)
+    fix_ia = map_fixations_to_interest_areas(fixations, interest_areas, cols, keys)
+
+    fix_group, word_group = _group_codes(fixations, words, keys)
+    word_ids = words[cols["ia_id"]].to_numpy(dtype=np.int64)
+
+    order = np.lexsort((fixations[cols["fix_index"]].to_numpy(), fix_group))
+    group = fix_group[order]
+    ia = fix_ia[order]
+    duration = fixations[cols["fix_duration"]].to_numpy(dtype=np.float64)[order]
+
+    # Runs: consecutive fixations on the same word within a trial. Unmapped
+    # fixations (ia == -1) still break runs before being discarded.
+    run_start = np.ones(len(ia), dtype=bool)
+    run_start[1:] = (group[1:] != group[:-1]) | (ia[1:] != ia[:-1])
+
+    # Furthest word reached strictly before each fixation.
+    prev_max = np.full(len(ia), -1, dtype=np.int64)
+    if len(ia):
+        running = _segment_cummax(ia, group)
+        same_group = np.zeros(len(ia), dtype=bool)
+        same_group[1:] = group[1:] == group[:-1]
+        prev_max[1:] = np.where(same_group[1:], running[:-1], -1)
+
+    run_id = np.cumsum(run_start) - 1
+    run_first_pass = (prev_max[run_start] < ia[run_start]) & (ia[run_start] >= 0)
+    first_pass = run_first_pass[run_id] if len(ia) else np.zeros(0, dtype=bool)
+
+    mapped = ia >= 0
+    group, ia, duration = group[mapped], ia[mapped], duration[mapped]
+    first_pass, run_start = first_pass[mapped], run_start[mapped]
+
+    # Regressions between consecutive mapped fixations of the same trial.
+    regression = np.zeros(len(ia), dtype=bool)
+    if len(ia) > 1:
+        regression[1:] = (group[1:] == group[:-1]) & (ia[1:] < ia[:-1])
+    regress_out = np.zeros(len(ia), dtype=bool)
+    regress_out[:-1] = regression[1:]
+
+    # Combined (trial, word) key shared by fixations and the word table.
+    id_min = min(word_ids.min() if len(word_ids) else 0, ia.min() if len(ia) else 0)
+    id_span = max(word_ids.max() if len(word_ids) else 0, ia.max() if len(ia) else 0) - id_min + 1
+    word_key = word_group * id_span + (word_ids - id_min)
+    fix_key = group * id_span + (ia - id_min)
+
+    key_order = np.argsort(word_key, kind="stable")
+    pos = np.searchsorted(word_key[key_order], fix_key)
+    pos = np.clip(pos, 0, max(len(word_key) - 1, 0))
+    if len(word_key):
+        known = word_key[key_order][pos] == fix_key
+    else:
+        known = np.zeros(len(fix_key), dtype=bool)
+    slot = key_order[pos][known]
+    n_words = len(words)
+
+    def _sum(weights: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        m = known if mask is None else known & mask
+        return np.bincount(key_order[pos][m], weights=weights[m], minlength=n_words)
+
+    total_time = _sum(duration)
+    fixation_count = np.bincount(slot, minlength=n_words)
+    gaze = _sum(duration, first_pass)
+    first_fix = _sum(duration, first_pass & run_start)
+    has_first_pass = _sum(np.ones(len(ia)), first_pass & run_start) > 0
+    regressions_in = _sum(np.ones(len(ia)), regression).astype(np.int64)
+    regressions_out = _sum(np.ones(len(ia)), regress_out).astype(np.int64)
+
+    result = words.copy()
+    result["first_fixation_duration"] = np.where(has_first_pass, first_fix, np.nan)
+    result["gaze_duration"] = np.where(has_first_pass, gaze, np.nan)
+    result["total_reading_time"] = total_time
+    result["fixation_count"] = fixation_count.astype(np.int64)
+    result["skipped"] = ~has_first_pass
+    result["regressions_in"] = regressions_in
+    result["regressions_out"] = regressions_out
+    return result
+
+
+def _measures_for_partition(args):
+    """Worker entry point for a single participant partition."""
+    fixations, interest_areas, columns, group_by = args
+    return compute_reading_measures(fixations, interest_areas, columns, group_by)
+
+
+def join_reading_measures(
+    fixations: pd.DataFrame,
+    interest_areas: pd.DataFrame,
+    columns: Optional[Dict[str, str]] = None,
+    group_by: Optional[Sequence[str]] = None,
+    n_jobs: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Compute word-level reading measures with work partitioned by participant.
+
+    Args:
+        fixations: Fixation report
+        interest_areas: Interest-area report
+        columns: Optional overrides for ``DEFAULT_COLUMNS``
+        group_by: Columns identifying a trial (defaults to participant + paragraph)
+        n_jobs: Number of worker processes (defaults to ``os.cpu_count()``;
+            1 runs in the current process)
+
+    Returns:
+        Concatenated per-word measures for all participants
+    """
+    cols = _resolve_columns(columns)
+    participant = cols["participant"]
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    ia_groups = dict(tuple(interest_areas.groupby(participant, sort=False)))
+    fix_groups = dict(tuple(fixations.groupby(participant, sort=False)))
+    tasks = [
+        (fix_groups.get(pid, fixations.iloc[0:0]), ia_frame, cols, group_by)
+        for pid, ia_frame in ia_groups.items()
+    ]
+    if not tasks:
+        return compute_reading_measures(fixations, interest_areas, cols, group_by)
+
+    if n_jobs == 1 or len(tasks) == 1:
+        parts = [_measures_for_partition(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            parts = list(executor.map(_measures_for_partition, tasks))
+
+    return pd.concat(parts, ignore_index=True)
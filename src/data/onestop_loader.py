@@ -1,6 +1,14 @@
 # src/data/onestop_loader.py
 from .base_loader import BaseDatasetLoader
+from .interest_area_join import DEFAULT_COLUMNS, compute_reading_measures
+from .quality import DEFAULT_SCREEN, TrialQualityAccumulator, quality_options
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+import os
+import numpy as np
+import pandas as pd
 
 class OneStopLoader(BaseDatasetLoader):
     BASE_URL = "https://osf.io/download/"
@@ -11,9 +19,30 @@ class OneStopLoader(BaseDatasetLoader):
         # ... other modes if needed
     }
 
-    def __init__(self, output_folder="data/raw/OneStop", mode="ordinary", extract=True):
-        super().__init__(output_folder, extract)
+    # EyeLink reports write "." for missing values
+    NA_VALUES = ["."]
+
+    # Fixation onset, only parsed for the timestamp-gap quality check
+    START_COLUMN = "CURRENT_FIX_START"
+
+    def __init__(self, output_folder="data/raw/OneStop", mode="ordinary", extract=True,
+                 chunksize=100_000, quality_checks=True, quality_thresholds=None,
+                 exclude_flagged=True, screen=DEFAULT_SCREEN, monitor=None):
+        super().__init__(output_folder, extract, monitor)
         self.mode = mode
+        self.chunksize = chunksize
+        self.quality_checks = quality_checks
+        self.quality_thresholds = quality_thresholds
+        self.exclude_flagged = exclude_flagged
+        self.screen = screen
+
+    @classmethod
+    def from_config(cls, config: dict, **kwargs):
+        """Build a loader whose quality checks follow the ``data.quality`` config section."""
+        options = quality_options(config)
+        options["output_folder"] = str(Path(config["data"]["raw_dir"]) / "OneStop")
+        options.update(kwargs)
+        return cls(**options)
 
     def download(self):
         resources = self.URLS.get(self.mode)
@@ -30,3 +59,201 @@ class OneStopLoader(BaseDatasetLoader):
     def preprocess(self):
         """Later: implement CSV parsing, interpolation, normalization, etc."""
         print(f"[INFO] Preprocessing OneStop {self.mode} dataset...")
+        fixation_files = sorted(self.output_folder.glob("*fixations*Paragraph*.csv"))
+        ia_files = sorted(self.output_folder.glob("*ia*Paragraph*.csv"))
+        if len(fixation_files) > 1 or len(ia_files) > 1:
+            print(f"[WARN] Found {len(fixation_files)} fixation and {len(ia_files)} interest-area "
+                  f"reports; only {fixation_files[0].name} and {ia_files[0].name} are joined.")
+        if fixation_files and ia_files:
+            self.build_word_measures(fixation_files[0], ia_files[0])
+
+    def build_word_measures(self, fixations_path: Path, ia_path: Path, n_jobs=None) -> Path:
+        """
+        Join fixations to interest areas and save word-level reading measures.
+
+        Participant blocks handed on by ``ingest_fixations`` are joined by one
+        process pool for the whole file while parsing continues, and written
+        in order as they finish. Only the interest-area join columns are held
+        in memory, indexed by participant once.
+        """
+        print(f"[INFO] Joining {fixations_path.name} with {ia_path.name}")
+        cols = DEFAULT_COLUMNS
+        keys = [cols["participant"], cols["paragraph"]]
+        ia_columns = keys + [cols[name] for name in
+                             ("ia_id", "ia_left", "ia_right", "ia_top", "ia_bottom")]
+        # Fixation keys are parsed as string categories, so read the IA keys as
+        # strings too; numeric ids would otherwise never match.
+        interest_areas = pd.read_csv(ia_path, na_values=self.NA_VALUES, usecols=ia_columns,
+                                     dtype={key: str for key in keys})
+        interest_areas = interest_areas.sort_values(keys[0], kind="stable", ignore_index=True)
+        pids = interest_areas[keys[0]].to_numpy()
+        bounds = np.flatnonzero(pids[1:] != pids[:-1]) + 1
+        starts, stops = np.append(0, bounds), np.append(bounds, len(pids))
+        ia_rows = {
+            pids[start]: slice(start, stop) for start, stop in zip(starts, stops) if start < stop
+        }
+
+        out_path = self.output_folder / f"{self.mode}_word_measures.csv"
+        n_jobs = n_jobs or os.cpu_count() or 1
+        written = []
+
+        def write(measures: pd.DataFrame):
+            measures.to_csv(out_path, mode="a" if written else "w", header=not written, index=False)
+            written.append(len(measures))
+
+        pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else nullcontext()
+        with pool as executor:
+            running = deque()
+
+            def join_block(fixations: pd.DataFrame):
+                block_trials = pd.MultiIndex.from_frame(fixations[keys].astype(object)).unique()
+                parts = [interest_areas.iloc[ia_rows[pid]]
+                         for pid in block_trials.unique(level=0) if pid in ia_rows]
+                block_ias = pd.concat(parts) if parts else interest_areas.iloc[0:0]
+                block_ias = block_ias[pd.MultiIndex.from_frame(block_ias[keys]).isin(block_trials)]
+                if executor is None:
+                    write(compute_reading_measures(fixations, block_ias))
+                    return
+                running.append(executor.submit(compute_reading_measures, fixations, block_ias))
+                # Bound the blocks in flight so memory does not grow with the file
+                if len(running) > n_jobs:
+                    write(running.popleft().result())
+
+            self.ingest_fixations(fixations_path, sink=join_block)
+            while running:
+                write(running.popleft().result())
+
+        if not written:
+            pd.DataFrame().to_csv(out_path, index=False)
+        print(f"[INFO] Saved {sum(written)} word-level reading measures → {out_path}")
+        return out_path
+
+    def ingest_fixations(self, fixations_path: Path, sink=None):
+        """
+        Stream the fixation report in chunks, computing per-trial quality metrics in the same pass.
+
+        The report must be sorted by participant (as EyeLink exports are):
+        each participant's rows contiguous, trials in order within them.
+        Only the columns used downstream are parsed. Rows are handed on per
+        completed participant with flagged trials already dropped, so with a
+        ``sink`` memory stays bounded by a chunk plus one participant's rows.
+
+        Args:
+            fixations_path: Path to the fixation report
+            sink: Optional callable receiving each participant block; blocks are
+                then not kept and the returned fixations are None
+
+        Returns:
+            (fixations, trial_index); trial_index is None when quality checks are disabled
+
+        Raises:
+            ValueError: If a participant's rows reappear after another participant's
+        """
+        cols = DEFAULT_COLUMNS
+        participant = cols["participant"]
+        fixation_cols = [participant, cols["paragraph"], cols["fix_index"],
+                         cols["fix_x"], cols["fix_y"], cols["fix_duration"]]
+        needed = list(fixation_cols)
+        # Trial keys are parsed as categoricals: cheaper than Python strings and
+        # gives the quality checks integer codes to compare.
+        dtypes = {participant: "category", cols["paragraph"]: "category"}
+        accumulator = None
+        if self.quality_checks:
+            # Gaps use start + duration, so the checks parse a single extra column
+            accumulator = TrialQualityAccumulator(
+                trial_cols=[participant, cols["paragraph"]],
+                x_col=cols["fix_x"],
+                y_col=cols["fix_y"],
+                start_col=self.START_COLUMN,
+                duration_col=cols["fix_duration"],
+                nan_cols=[cols["fix_x"], cols["fix_y"], cols["fix_duration"]],
+                screen=self.screen,
+            )
+            needed.append(self.START_COLUMN)
+            dtypes[self.START_COLUMN] = np.float64
+
+        blocks, pending = [], []
+        # Participants already handed on, and the one whose rows are pending
+        completed, current = set(), None
+
+        def hand_off(frames, final=False):
+            block = pd.concat(frames, ignore_index=True)
+            if accumulator is not None:
+                # The flushed trials are exactly the rows of this block, in order
+                excluded = accumulator.flush(self.quality_thresholds, final=final)
+                if self.exclude_flagged and excluded.any():
+                    block = block[~excluded].reset_index(drop=True)
+            if sink is not None:
+                sink(block)
+            else:
+                blocks.append(block)
+
+        chunksize = self.chunksize
+        with pd.read_csv(fixations_path, iterator=True, na_values=self.NA_VALUES, dtype=dtypes,
+                         usecols=lambda name: name in needed) as reader:
+            while True:
+                try:
+                    chunk = reader.get_chunk(chunksize)
+                except StopIteration:
+                    break
+                if chunk.empty:
+                    continue
+                if accumulator is not None:
+                    if accumulator.start_col not in chunk.columns:
+                        accumulator.start_col = None
+                    accumulator.update(chunk)
+                    if accumulator.start_col:
+                        # The timestamp only feeds the gap check
+                        chunk = chunk.drop(columns=accumulator.start_col)
+
+                # Rows are ordered by participant: everything before the last
+                # participant of this chunk belongs to completed participants.
+                keys = chunk[participant]
+                codes = keys.cat.codes.to_numpy()
+                starts = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+                order = keys.cat.categories[codes[np.append(0, starts)]].tolist()
+                continues = order[0] == current
+                new = order[1:] if continues else order
+                repeated = completed.intersection(new) or len(set(new)) < len(new) or current in new
+                if repeated:
+                    pid = next(p for p in new if p in completed or p == current or new.count(p) > 1)
+                    raise ValueError(
+                        f"{fixations_path.name}: rows of participant {pid!r} are not contiguous; "
+                        f"sort the fixation report by participant before ingestion"
+                    )
+                if new:
+                    if current is not None:
+                        completed.add(current)
+                    completed.update(new[:-1])
+                    current = new[-1]
+
+                tail = starts[-1] if starts.size else 0
+                if tail:
+                    hand_off(pending + [chunk.iloc[:tail]])
+                    pending = [chunk.iloc[tail:]]
+                elif pending and not continues:
+                    hand_off(pending)
+                    pending = [chunk]
+                else:
+                    pending.append(chunk)
+
+                if self.monitor is not None:
+                    chunksize = self.monitor.suggest_chunksize(chunksize, maximum=self.chunksize)
+
+        if pending:
+            # The last participant is complete once the stream ends
+            hand_off(pending, final=True)
+
+        fixations = None
+        if sink is None:
+            fixations = pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame()
+
+        if accumulator is None:
+            return fixations, None
+
+        trial_index = accumulator.finalize(self.quality_thresholds)
+        index_path = self.output_folder / f"{self.mode}_trial_index.csv"
+        trial_index.to_csv(index_path, index=False)
+        print(f"[INFO] {int(trial_index['excluded'].sum())}/{len(trial_index)} trials flagged "
+              f"by quality checks → {index_path}")
+        return fixations, trial_index
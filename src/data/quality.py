@@ -0,0 +1,338 @@
+"""Per-trial data-quality checks fused into chunked ingestion.
+
+Quality metrics are accumulated chunk by chunk while the loaders parse their
+raw files, so no second pass over the data is needed. The finalized metrics
+form a metadata index (one row per trial) with an ``excluded`` flag and the
+reasons a trial failed the configured thresholds.
+
+Metrics per trial:
+    - n_samples          → rows seen for the trial
+    - track_loss_ratio   → rows with missing x or y coordinates
+    - offscreen_ratio    → rows with coordinates outside the screen
+    - nan_ratio          → missing cells across the checked columns
+    - max_gap            → largest gap between consecutive rows (start - previous end,
+                           where end may be derived as start + duration)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import h5py
+import numpy as np
+import pandas as pd
+
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "max_track_loss_ratio": 0.2,
+    "max_offscreen_ratio": 0.1,
+    "max_nan_ratio": 0.5,
+    "max_gap": 1000.0,
+    "min_samples": 1,
+}
+
+DEFAULT_SCREEN = (1920, 1080)
+
+
+class TrialQualityAccumulator:
+    """
+    Accumulate vectorized per-trial quality metrics over streamed chunks.
+
+    Rows are expected to arrive ordered by trial and time, as in EyeLink
+    reports. Gaps across chunk boundaries are handled by carrying the last
+    row's trial key and end time into the next chunk. ``flush()`` releases
+    completed participants as the stream advances.
+    """
+
+    def __init__(
+        self,
+        trial_cols: Sequence[str],
+        x_col: str,
+        y_col: str,
+        start_col: Optional[str] = None,
+        end_col: Optional[str] = None,
+        duration_col: Optional[str] = None,
+        nan_cols: Optional[Sequence[str]] = None,
+        screen: Sequence[float] = DEFAULT_SCREEN,
+    ):
+        """
+        Initialize the accumulator.
+
+        Args:
+            trial_cols: Columns identifying a trial
+            x_col: Horizontal gaze coordinate column
+            y_col: Vertical gaze coordinate column
+            start_col: Optional row start timestamp column
+            end_col: Optional row end timestamp column
+            duration_col: Optional row duration column; without ``end_col`` the
+                end is derived as start + duration, saving a parsed column
+            nan_cols: Columns checked for missing values (defaults to x and y)
+            screen: Screen (width, height) in pixels
+        """
+        self.trial_cols = list(trial_cols)
+        self.x_col = x_col
+        self.y_col = y_col
+        self.start_col = start_col
+        self.end_col = end_col
+        self.duration_col = duration_col
+        self.nan_cols = list(nan_cols) if nan_cols else [x_col, y_col]
+        self.width, self.height = screen
+        self._partials: List[Dict[str, np.ndarray]] = []
+        self._finalized: List[Dict[str, np.ndarray]] = []
+        self._carry_key = None
+        self._carry_end = np.nan
+
+    def update(self, chunk: pd.DataFrame):
+        """Add the metrics of one parsed chunk."""
+        if chunk.empty:
+            return
+
+        # Work on plain numpy arrays: building pandas objects per chunk costs
+        # more than the metrics themselves.
+        arrays = {
+            col: chunk[col].to_numpy(dtype=np.float64)
+            for col in dict.fromkeys([self.x_col, self.y_col] + self.nan_cols)
+        }
+        missing = {col: np.isnan(values) for col, values in arrays.items()}
+        x, y = arrays[self.x_col], arrays[self.y_col]
+        lost = missing[self.x_col] | missing[self.y_col]
+        # NaN compares False, so lost rows never count as off-screen
+        offscreen = (x < 0) | (x > self.width) | (y < 0) | (y > self.height)
+        nan_cells = np.zeros(len(chunk), dtype=np.int64)
+        for col in self.nan_cols:
+            nan_cells += missing[col]
+
+        # Rows are ordered by trial, so each trial is a contiguous segment and
+        # per-trial sums reduce to np.add.reduceat over segment starts. Keys are
+        # compared as integer codes (categorical columns from the parser, else
+        # factorized once here) rather than element-wise on string objects.
+        key_columns = [chunk[col] for col in self.trial_cols]
+        key_codes = [self._key_codes(column) for column in key_columns]
+        same_trial = np.ones(len(chunk), dtype=bool)
+        for codes in key_codes:
+            same_trial[1:] &= codes[1:] == codes[:-1]
+        same_trial[0] = False
+        starts = np.flatnonzero(~same_trial)
+
+        partial = {
+            col: self._key_values(column, codes, starts)
+            for col, column, codes in zip(self.trial_cols, key_columns, key_codes)
+        }
+        partial["n_samples"] = np.diff(np.append(starts, len(chunk)))
+        partial["n_track_loss"] = np.add.reduceat(lost, starts, dtype=np.int64)
+        partial["n_offscreen"] = np.add.reduceat(offscreen, starts, dtype=np.int64)
+        partial["n_nan_cells"] = np.add.reduceat(nan_cells, starts)
+
+        if self.start_col and (self.end_col or self.duration_col):
+            first_key = tuple(partial[col][0] for col in self.trial_cols)
+            same_trial[0] = first_key == self._carry_key
+
+            start = chunk[self.start_col].to_numpy(dtype=np.float64)
+            if self.end_col:
+                end = chunk[self.end_col].to_numpy(dtype=np.float64)
+            else:
+                duration = arrays.get(self.duration_col)
+                if duration is None:
+                    duration = chunk[self.duration_col].to_numpy(dtype=np.float64)
+                end = start + duration
+            prev_end = np.empty(len(chunk))
+            prev_end[1:] = end[:-1]
+            prev_end[0] = self._carry_end
+            gaps = np.where(same_trial, start - prev_end, np.nan)
+            partial["max_gap"] = np.fmax.reduceat(gaps, starts)
+            self._carry_key = tuple(partial[col][-1] for col in self.trial_cols)
+            self._carry_end = end[-1]
+
+        self._partials.append(partial)
+
+    @staticmethod
+    def _key_codes(column: pd.Series) -> np.ndarray:
+        """Integer codes of a trial-key column, consistent within one chunk."""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return column.cat.codes.to_numpy()
+        return pd.factorize(column)[0]
+
+    @staticmethod
+    def _key_values(column: pd.Series, codes: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """Key values at the segment starts, as a plain object array."""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return column.cat.categories.to_numpy(dtype=object)[codes[starts]]
+        return column.iloc[starts].to_numpy(dtype=object)
+
+    def flush(
+        self, thresholds: Optional[Dict[str, float]] = None, final: bool = False
+    ) -> np.ndarray:
+        """
+        Finalize the trials whose outer key (``trial_cols[0]``) is complete.
+
+        Rows arrive ordered by the outer key (the participant), so every trial
+        except those of the most recently seen outer key is done. Their metrics
+        move to the index returned by ``finalize()`` and the rest wait for later
+        chunks. Streaming loaders call this per chunk to hand data on per
+        participant instead of holding the whole report; it stays in numpy so
+        per-chunk calls are cheap.
+
+        Args:
+            thresholds: Optional overrides for ``DEFAULT_THRESHOLDS``
+            final: Finalize every remaining trial (end of the stream)
+
+        Returns:
+            Row mask over the finalized trials, in stream order; True marks
+            rows of excluded trials
+        """
+        if not self._partials:
+            return np.zeros(0, dtype=bool)
+
+        combined = {
+            name: np.concatenate([partial[name] for partial in self._partials])
+            for name in self._partials[0]
+        }
+        outer = combined[self.trial_cols[0]]
+        done = np.ones(len(outer), dtype=bool) if final else outer != outer[-1]
+        if done.all():
+            self._partials = []
+        else:
+            self._partials = [{name: values[~done] for name, values in combined.items()}]
+        if not done.any():
+            return np.zeros(0, dtype=bool)
+
+        metrics = self._metrics({name: values[done] for name, values in combined.items()})
+        self._finalized.append(metrics)
+        excluded = _failed_checks(metrics, len(metrics["n_samples"]), thresholds)[0].any(axis=1)
+        return np.repeat(excluded, metrics["n_samples"])
+
+    def finalize(self, thresholds: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Build the per-trial metadata index of every trial seen.
+
+        Args:
+            thresholds: Optional overrides for ``DEFAULT_THRESHOLDS`` (use the
+                same ones passed to ``flush()``)
+
+        Returns:
+            DataFrame with one row per trial, ratios, ``excluded`` and ``exclusion_reasons``
+        """
+        self.flush(thresholds, final=True)
+        if not self._finalized:
+            columns = self.trial_cols + ["n_samples", "track_loss_ratio", "offscreen_ratio",
+                                         "nan_ratio", "excluded", "exclusion_reasons"]
+            return pd.DataFrame(columns=columns)
+
+        metrics = {
+            name: np.concatenate([part[name] for part in self._finalized])
+            for name in self._finalized[0]
+        }
+        self._finalized = []
+        return apply_thresholds(pd.DataFrame(metrics), thresholds)
+
+    def _metrics(self, combined: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Sum segment partials per trial and derive the ratios."""
+        # Partials are ordered by trial; a trial split across chunks leaves
+        # adjacent segments with the same key, merged here with reduceat.
+        same_trial = np.ones(len(combined["n_samples"]), dtype=bool)
+        for col in self.trial_cols:
+            same_trial[1:] &= combined[col][1:] == combined[col][:-1]
+        same_trial[0] = False
+        starts = np.flatnonzero(~same_trial)
+
+        n_samples = np.add.reduceat(combined["n_samples"], starts)
+        n_cells = n_samples * len(self.nan_cols)
+        metrics = {col: combined[col][starts] for col in self.trial_cols}
+        metrics["n_samples"] = n_samples
+        metrics["track_loss_ratio"] = np.add.reduceat(combined["n_track_loss"], starts) / n_samples
+        metrics["offscreen_ratio"] = np.add.reduceat(combined["n_offscreen"], starts) / n_samples
+        metrics["nan_ratio"] = np.add.reduceat(combined["n_nan_cells"], starts) / n_cells
+        if "max_gap" in combined:
+            metrics["max_gap"] = np.fmax.reduceat(combined["max_gap"], starts)
+        return metrics
+
+
+def _failed_checks(metrics, n_rows: int, thresholds: Optional[Dict[str, float]] = None):
+    """
+    Evaluate the threshold rules on metric columns.
+
+    Args:
+        metrics: Mapping of metric name to values (DataFrame or dict of arrays)
+        n_rows: Number of rows in ``metrics``
+        thresholds: Optional overrides for ``DEFAULT_THRESHOLDS``
+
+    Returns:
+        (failed, names): boolean matrix with one column per applicable rule, and the rule names
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        limits.update(thresholds)
+
+    rules = [
+        ("track_loss", "track_loss_ratio", lambda v: v > limits["max_track_loss_ratio"]),
+        ("offscreen", "offscreen_ratio", lambda v: v > limits["max_offscreen_ratio"]),
+        ("nan_heavy", "nan_ratio", lambda v: v > limits["max_nan_ratio"]),
+        ("too_short", "n_samples", lambda v: v < limits["min_samples"]),
+        ("timestamp_gap", "max_gap", lambda v: np.nan_to_num(v) > limits["max_gap"]),
+        ("malformed", "malformed", lambda v: v.astype(bool)),
+    ]
+    checks = {
+        name: rule(np.asarray(metrics[col], dtype=np.float64))
+        for name, col, rule in rules if col in metrics
+    }
+    if not checks:
+        return np.zeros((n_rows, 0), dtype=bool), []
+    return np.column_stack(list(checks.values())), list(checks)
+
+
+def apply_thresholds(
+    index: pd.DataFrame, thresholds: Optional[Dict[str, float]] = None
+) -> pd.DataFrame:
+    """
+    Flag trials that fail any configured quality threshold.
+
+    Args:
+        index: Per-trial metrics
+        thresholds: Optional overrides for ``DEFAULT_THRESHOLDS``
+
+    Returns:
+        Copy of ``index`` with ``excluded`` and ``exclusion_reasons`` columns
+    """
+    failed, names = _failed_checks(index, len(index), thresholds)
+    excluded = failed.any(axis=1)
+    reasons = np.full(len(index), "", dtype=object)
+    rule_names = np.array(names, dtype=object)
+    reasons[excluded] = [";".join(rule_names[row]) for row in failed[excluded]]
+    return index.assign(excluded=excluded, exclusion_reasons=reasons)
+
+
+def quality_options(config: dict) -> Dict[str, object]:
+    """
+    Translate the ``data.quality`` config section into loader keyword arguments.
+
+    Args:
+        config: Full configuration dictionary
+
+    Returns:
+        Dictionary with ``quality_checks``, ``exclude_flagged``, ``screen`` and
+        ``quality_thresholds``
+    """
+    section = config.get("data", {}).get("quality") or {}
+    return {
+        "quality_checks": section.get("enabled", True),
+        "exclude_flagged": section.get("exclude_flagged", True),
+        "screen": tuple(section.get("screen", DEFAULT_SCREEN)),
+        "quality_thresholds": {k: v for k, v in section.items() if k in DEFAULT_THRESHOLDS},
+    }
+
+
+def check_mat_file(path: Path) -> Dict[str, object]:
+    """
+    Check that a ``.mat`` (HDF5) file can be opened and list its top-level keys.
+
+    Args:
+        path: Path to the ``.mat`` file
+
+    Returns:
+        Dictionary with ``file``, ``malformed``, ``n_keys`` and ``error``
+    """
+    path = Path(path)
+    try:
+        with h5py.File(path, "r") as f:
+            n_keys = len(f.keys())
+        return {"file": path.name, "malformed": False, "n_keys": n_keys, "error": ""}
+    except (OSError, ValueError) as e:
+        return {"file": path.name, "malformed": True, "n_keys": 0, "error": str(e)}
@@ -1,7 +1,9 @@
 from .base_loader import BaseDatasetLoader
+from .quality import apply_thresholds, check_mat_file, quality_options
 # from .helpers import data_loading_helpers as helpers # <-- BROKEN IMPORT COMMENTED OUT
 import h5py
 import numpy as np
+import pandas as pd
 from pathlib import Path
 
 class ZucoLoader(BaseDatasetLoader):
@@ -10,8 +12,20 @@ class ZucoLoader(BaseDatasetLoader):
     Handles extraction of word-level EEG and ET signals.
     """
 
-    def __init__(self, output_folder="data/raw/ZuCo", extract=True):
-        super().__init__(output_folder, extract)
+    def __init__(self, output_folder="data/raw/ZuCo", extract=True, quality_checks=True,
+                 monitor=None):
+        super().__init__(output_folder, extract, monitor)
+        self.quality_checks = quality_checks
+
+    @classmethod
+    def from_config(cls, config: dict, **kwargs):
+        """Build a loader whose quality checks follow ``data.quality.enabled``."""
+        options = {
+            "output_folder": str(Path(config["data"]["raw_dir"]) / "ZuCo"),
+            "quality_checks": quality_options(config)["quality_checks"],
+        }
+        options.update(kwargs)
+        return cls(**options)
 
     def download(self):
         # Optional — only if you want to auto-download from OSF
@@ -22,7 +36,10 @@ class ZucoLoader(BaseDatasetLoader):
         mat_files = list(data_dir.glob("*.mat"))
 
         all_sentences = []
-        
+
+        if self.quality_checks:
+            mat_files = self._check_files(mat_files)
+
         # NOTE: The helper function 'extract_word_level_data' is not available
         # until the 'helpers' module is restored or the logic is moved here.
         # For now, we will skip the processing step to allow the module to import.
@@ -50,3 +67,15 @@ class ZucoLoader(BaseDatasetLoader):
         #     print("[INFO] No data was processed or saved.")
 
         return # Exit preprocess cleanly
+
+    def _check_files(self, mat_files):
+        """Record malformed .mat files in the metadata index and return the readable ones."""
+        checks = pd.DataFrame([check_mat_file(f) for f in mat_files],
+                              columns=["file", "malformed", "n_keys", "error"])
+        file_index = apply_thresholds(checks)
+        index_path = Path(self.output_folder) / "zuco_file_index.csv"
+        file_index.to_csv(index_path, index=False)
+        print(f"[INFO] {int(file_index['excluded'].sum())}/{len(file_index)} .mat files "
+              f"flagged → {index_path}")
+        excluded = set(file_index.loc[file_index["excluded"], "file"])
+        return [f for f in mat_files if f.name not in excluded]
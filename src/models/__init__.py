@@ -1,5 +1,6 @@
 """Model architectures and components."""
 
 from .encoder import DummyEncoder
+from .ensemble import FoldEnsemble
 
-__all__ = ["DummyEncoder"]
+__all__ = ["DummyEncoder", "FoldEnsemble"]
@@ -1 +1,15 @@
 """Training utilities and scripts."""
+
+from .cross_validation import (
+    aggregate_metrics,
+    build_classifier,
+    participant_folds,
+    run_cross_validation,
+)
+
+__all__ = [
+    "aggregate_metrics",
+    "build_classifier",
+    "participant_folds",
+    "run_cross_validation",
+]
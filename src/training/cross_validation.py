@@ -0,0 +1,286 @@
+"""Participant-grouped k-fold cross-validation with folds trained in parallel."""
+
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+from scipy import stats
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedGroupKFold
+
+from ..models.encoder import DummyEncoder
+from ..models.ensemble import FoldEnsemble
+from ..utils.logger import get_logger
+from ..utils.resources import ResourceMonitor
+
+
+def build_classifier(model_config: dict) -> nn.Module:
+    """
+    Build the encoder followed by a single-logit dyslexia head.
+
+    Args:
+        model_config: The ``model.encoder`` section of the config
+
+    Returns:
+        Model mapping (batch_size, input_dim) → (batch_size,) logits
+    """
+    encoder = DummyEncoder(
+        input_dim=model_config['input_dim'],
+        hidden_dim=model_config['hidden_dim'],
+        output_dim=model_config['output_dim'],
+        num_layers=model_config['num_layers'],
+        dropout=model_config['dropout']
+    )
+    return nn.Sequential(encoder, nn.Linear(model_config['output_dim'], 1), nn.Flatten(0))
+
+
+def participant_folds(
+    groups: np.ndarray,
+    labels: np.ndarray,
+    n_splits: int,
+    seed: int = 0,
+) -> List[Dict[str, np.ndarray]]:
+    """
+    Split sample indices so that no participant appears in more than one fold.
+
+    Folds are stratified on the labels and shuffled with ``seed`` so that,
+    with per-participant diagnoses, each validation fold keeps both classes
+    whenever the participant counts allow it.
+
+    Args:
+        groups: Participant id per sample
+        labels: Binary label per sample
+        n_splits: Number of folds
+        seed: Random seed for the participant shuffle
+
+    Returns:
+        List of {"train": indices, "val": indices}
+    """
+    splitter = StratifiedGroupKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    placeholder = np.zeros(len(groups))
+    return [
+        {"train": train_idx, "val": val_idx}
+        for train_idx, val_idx in splitter.split(placeholder, labels, groups=groups)
+    ]
+
+
+def train_fold(task: dict) -> dict:
+    """
+    Train and evaluate one fold. Runs inside a worker process.
+
+    Features and labels are opened with ``mmap_mode="r"`` so every worker
+    shares the same read-only pages instead of holding its own copy.
+
+    Args:
+        task: Fold index, data paths, split indices, config and output directory
+
+    Returns:
+        Dictionary of validation metrics and the checkpoint path
+    """
+    torch.set_num_threads(task["num_threads"])
+    torch.manual_seed(task["seed"] + task["fold"])
+
+    features = np.load(task["features_path"], mmap_mode="r")
+    labels = np.load(task["labels_path"], mmap_mode="r")
+    train_idx, val_idx = task["train"], task["val"]
+
+    config = task["config"]
+    model = build_classifier(config['model']['encoder'])
+    train_config = config['training']
+    optimizer = torch.optim.Adam(
+        model.parameters(),
+        lr=train_config['learning_rate'],
+        weight_decay=train_config.get('weight_decay', 0.0)
+    )
+    loss_fn = nn.BCEWithLogitsLoss()
+    batch_size = config['data']['batch_size']
+    rng = np.random.default_rng(task["seed"] + task["fold"])
+    monitor = ResourceMonitor.from_config(config, name=f"fold_{task['fold']}")
+
+    model.train()
+    for _ in range(train_config['epochs']):
+        # RSS/CPU/file-handle snapshots once per epoch; batch phases only
+        # accumulate perf_counter sums and tag the phase for the background
+        # sampler's RSS peaks, so accounting stays off the hot path.
+        phase_time = {"data_loading": 0.0, "forward": 0.0, "backward": 0.0}
+        n_batches = 0
+        with monitor.stage("epoch"):
+            order = rng.permutation(train_idx)
+            for start in range(0, len(order), batch_size):
+                t0 = time.perf_counter()
+                monitor.phase("data_loading")
+                # Sorted fancy indexing keeps reads from the memory map sequential
+                batch = np.sort(order[start:start + batch_size])
+                x = torch.from_numpy(np.asarray(features[batch], dtype=np.float32))
+                y = torch.from_numpy(np.asarray(labels[batch], dtype=np.float32))
+                t1 = time.perf_counter()
+                monitor.phase("forward")
+                optimizer.zero_grad()
+                loss = loss_fn(model(x), y)
+                t2 = time.perf_counter()
+                monitor.phase("backward")
+                loss.backward()
+                optimizer.step()
+                t3 = time.perf_counter()
+                phase_time["data_loading"] += t1 - t0
+                phase_time["forward"] += t2 - t1
+                phase_time["backward"] += t3 - t2
+                n_batches += 1
+            monitor.phase(None)
+        for phase, seconds in phase_time.items():
+            monitor.add_timing(phase, seconds, n_batches)
+
+    model.eval()
+    with torch.no_grad():
+        x = torch.from_numpy(np.asarray(features[val_idx], dtype=np.float32))
+        y = np.asarray(labels[val_idx], dtype=np.float32)
+        logits = model(x)
+        val_loss = loss_fn(logits, torch.from_numpy(y)).item()
+        probs = torch.sigmoid(logits).numpy()
+
+    metrics = {
+        "fold": task["fold"],
+        "val_loss": val_loss,
+        "accuracy": float(((probs >= 0.5) == y).mean()),
+        "auc": float(roc_auc_score(y, probs)) if len(np.unique(y)) > 1 else float("nan"),
+    }
+
+    checkpoint = Path(task["output_dir"]) / f"fold_{task['fold']}.pt"
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), checkpoint)
+    metrics["checkpoint"] = str(checkpoint)
+
+    monitor.close()
+    report_path = monitor.save_report(checkpoint.with_name(f"fold_{task['fold']}_resources.json"))
+    metrics["resource_report"] = str(report_path)
+    return metrics
+
+
+def aggregate_metrics(fold_metrics: List[dict], confidence: float = 0.95) -> Dict[str, dict]:
+    """
+    Summarize fold metrics with a Student-t confidence interval.
+
+    Folds where a metric is undefined (e.g. AUC on a single-class fold) are
+    left out of that metric's interval; ``n_folds`` and ``n_undefined``
+    record how many folds it is based on.
+
+    Args:
+        fold_metrics: One metrics dictionary per fold
+        confidence: Confidence level of the interval
+
+    Returns:
+        {metric: {"mean", "std", "ci_low", "ci_high", "n_folds", "n_undefined"}}
+    """
+    summary = {}
+    for name in ("val_loss", "accuracy", "auc"):
+        values = np.array([m[name] for m in fold_metrics], dtype=np.float64)
+        undefined = int(np.isnan(values).sum())
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            summary[name] = {
+                "mean": float("nan"), "std": float("nan"), "ci_low": float("nan"),
+                "ci_high": float("nan"), "n_folds": 0, "n_undefined": undefined,
+            }
+            continue
+        mean = values.mean()
+        std = values.std(ddof=1) if len(values) > 1 else 0.0
+        half_width = 0.0
+        if len(values) > 1:
+            t_crit = stats.t.ppf((1 + confidence) / 2, len(values) - 1)
+            half_width = t_crit * std / np.sqrt(len(values))
+        summary[name] = {
+            "mean": float(mean),
+            "std": float(std),
+            "ci_low": float(mean - half_width),
+            "ci_high": float(mean + half_width),
+            "n_folds": len(values),
+            "n_undefined": undefined,
+        }
+    return summary
+
+
+def run_cross_validation(
+    config: dict,
+    features_path: str,
+    labels_path: str,
+    groups_path: str,
+    output_dir: str = "models/cv",
+    n_splits: int = 5,
+    n_jobs: Optional[int] = None,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> dict:
+    """
+    Train participant-grouped folds in parallel and export them as an ensemble.
+
+    Args:
+        config: Configuration dictionary
+        features_path: ``.npy`` file of shape (num_samples, input_dim)
+        labels_path: ``.npy`` file of binary labels
+        groups_path: ``.npy`` file of participant ids
+        output_dir: Directory for fold checkpoints and the ensemble
+        n_splits: Number of folds
+        n_jobs: Worker processes (defaults to ``n_splits``; 1 runs in-process)
+        confidence: Confidence level for the metric intervals
+        seed: Base random seed
+
+    Returns:
+        Dictionary with per-fold metrics, the summary and the ensemble path
+    """
+    logger = get_logger("training")
+    groups = np.load(groups_path, allow_pickle=True)
+    labels = np.load(labels_path, mmap_mode="r")
+    folds = participant_folds(groups, labels, n_splits, seed)
+    n_jobs = min(n_jobs or n_splits, n_splits)
+    num_threads = max(1, (torch.get_num_threads() if n_jobs == 1 else (mp.cpu_count() // n_jobs)))
+
+    tasks = [
+        {
+            "fold": i,
+            "train": fold["train"],
+            "val": fold["val"],
+            "features_path": str(features_path),
+            "labels_path": str(labels_path),
+            "config": config,
+            "output_dir": output_dir,
+            "num_threads": num_threads,
+            "seed": seed,
+        }
+        for i, fold in enumerate(folds)
+    ]
+
+    logger.info(f"Training {n_splits} participant-grouped folds with {n_jobs} workers")
+    if n_jobs == 1:
+        fold_metrics = [train_fold(task) for task in tasks]
+    else:
+        # spawn avoids inheriting torch's thread pools through fork
+        context = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context) as executor:
+            fold_metrics = list(executor.map(train_fold, tasks))
+
+    summary = aggregate_metrics(fold_metrics, confidence)
+    for name, values in summary.items():
+        logger.info(
+            f"{name}: {values['mean']:.4f} ± {values['std']:.4f} "
+            f"({confidence:.0%} CI {values['ci_low']:.4f}–{values['ci_high']:.4f}, "
+            f"{values['n_folds']}/{len(fold_metrics)} folds)"
+        )
+        if values["n_undefined"]:
+            logger.warning(
+                f"{name} undefined on {values['n_undefined']} fold(s), excluded from its CI"
+            )
+
+    ensemble = FoldEnsemble.from_state_dicts(
+        [torch.load(m["checkpoint"], map_location="cpu") for m in fold_metrics],
+        lambda: build_classifier(config['model']['encoder'])
+    )
+    ensemble_path = Path(output_dir) / "ensemble.pt"
+    ensemble.save(ensemble_path)
+    logger.info(f"Fold ensemble saved to {ensemble_path}")
+
+    return {"folds": fold_metrics, "summary": summary, "ensemble_path": str(ensemble_path)}
@@ -1,5 +1,6 @@
 """Utility functions and helpers."""
 
 from .logger import setup_logger, get_logger
+from .resources import ResourceMonitor
 
-__all__ = ["setup_logger", "get_logger"]
+__all__ = ["setup_logger", "get_logger", "ResourceMonitor"]
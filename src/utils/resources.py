@@ -0,0 +1,361 @@
+"""Memory and resource accounting for pipeline stages and model runs."""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from .logger import get_logger
+
+MB = 1024 * 1024
+
+# Environment variable holding the soft memory budget (e.g. set in docker-compose)
+BUDGET_ENV_VAR = "MEMORY_BUDGET_MB"
+
+
+def _thread_names() -> Dict[int, str]:
+    """Map OS thread ids to Python thread names."""
+    return {t.native_id: t.name for t in threading.enumerate() if t.native_id is not None}
+
+
+def _torch_memory() -> Optional[Dict[str, float]]:
+    """
+    Report CUDA tensor memory if torch is already imported.
+
+    torch is never imported here so data stages do not pay its import cost.
+    torch has no allocator statistics for CPU tensors, so on CPU-only runs
+    this is None and tensor memory only shows up in RSS.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None or not torch.cuda.is_available():
+        return None
+    return {
+        "allocated_mb": torch.cuda.memory_allocated() / MB,
+        "reserved_mb": torch.cuda.memory_reserved() / MB,
+        "max_allocated_mb": torch.cuda.max_memory_allocated() / MB,
+    }
+
+
+class ResourceMonitor:
+    """
+    Sample memory, CPU and file-handle usage per named pipeline stage.
+
+    A background thread samples RSS every ``sample_interval`` seconds and
+    attributes the peak to every active stage. Re-entering a stage with the
+    same name accumulates into a single report entry; top allocators are
+    summed per allocation site across calls.
+
+    ``stage()`` snapshots RSS, threads and file handles on entry and exit,
+    so it suits coarse stages (download, preprocess, an epoch). For hot
+    per-batch phases, time them with ``time.perf_counter`` and record the
+    sums with ``add_timing()``; tagging the running phase with ``phase()``
+    lets the sampler attribute sampled RSS (and CUDA tensor) peaks to it.
+    """
+
+    def __init__(
+        self,
+        name: str = "run",
+        memory_budget_mb: Optional[float] = None,
+        sample_interval: float = 0.5,
+        trace_allocations: bool = False,
+        top_allocators: int = 10,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            name: Name of the run, used in the report
+            memory_budget_mb: Soft RSS budget; defaults to $MEMORY_BUDGET_MB if set
+            sample_interval: Seconds between background RSS samples
+            trace_allocations: Record tracemalloc top allocators per stage
+            top_allocators: Number of allocation sites kept per stage
+        """
+        if memory_budget_mb is None and os.environ.get(BUDGET_ENV_VAR):
+            memory_budget_mb = float(os.environ[BUDGET_ENV_VAR])
+
+        self.name = name
+        self.memory_budget_mb = memory_budget_mb
+        self.sample_interval = sample_interval
+        self.trace_allocations = trace_allocations
+        self.top_allocators = top_allocators
+        self.process = psutil.Process()
+        self.stages: Dict[str, dict] = {}
+        self.timings: Dict[str, dict] = {}
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.logger = get_logger("resources")
+
+        self._active: List[str] = []
+        self._phase: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._peak_rss_mb = 0.0
+
+    @classmethod
+    def from_config(cls, config: dict, name: str = "run"):
+        """Build a monitor from the ``resources`` config section."""
+        resource_config = config.get('resources') or {}
+        return cls(
+            name=name,
+            memory_budget_mb=resource_config.get('memory_budget_mb'),
+            sample_interval=resource_config.get('sample_interval', 0.5),
+            trace_allocations=resource_config.get('trace_allocations', False)
+        )
+
+    # ------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------
+    def rss_mb(self) -> float:
+        """Current resident set size in MB."""
+        return self.process.memory_info().rss / MB
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            rss = self.rss_mb()
+            phase = self._phase
+            torch_memory = _torch_memory() if phase is not None else None
+            with self._lock:
+                self._peak_rss_mb = max(self._peak_rss_mb, rss)
+                for stage in self._active:
+                    entry = self.stages[stage]
+                    entry["rss_peak_mb"] = max(entry["rss_peak_mb"], rss)
+                if phase is not None:
+                    entry = self._timing_entry(phase)
+                    entry["samples"] += 1
+                    entry["rss_peak_mb"] = max(entry["rss_peak_mb"], rss)
+                    if torch_memory is not None:
+                        entry["torch_allocated_peak_mb"] = max(
+                            entry.get("torch_allocated_peak_mb", 0.0), torch_memory["allocated_mb"]
+                        )
+
+    def _ensure_sampler(self):
+        if self._sampler is None or not self._sampler.is_alive():
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_loop, name="resource-sampler", daemon=True
+            )
+            self._sampler.start()
+
+    def close(self):
+        """Stop the background sampler."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _thread_cpu(self) -> Dict[int, float]:
+        return {t.id: t.user_time + t.system_time for t in self.process.threads()}
+
+    # ------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Account resources used inside the ``with`` block under ``name``.
+
+        Args:
+            name: Stage name (e.g. "download", "preprocess", "epoch")
+        """
+        self._ensure_sampler()
+        rss_start = self.rss_mb()
+        fds_start = self.process.num_fds() if hasattr(self.process, "num_fds") else None
+        cpu_start = self._thread_cpu()
+        wall_start = time.perf_counter()
+
+        started_tracing = False
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            snapshot_start = tracemalloc.take_snapshot()
+
+        with self._lock:
+            entry = self.stages.setdefault(name, {
+                "calls": 0,
+                "duration_s": 0.0,
+                "rss_start_mb": rss_start,
+                "rss_end_mb": rss_start,
+                "rss_peak_mb": rss_start,
+                "rss_delta_mb": 0.0,
+                "open_files_delta": 0,
+                "thread_cpu_s": {},
+                "top_allocators": [],
+                "torch": None,
+            })
+            entry["rss_peak_mb"] = max(entry["rss_peak_mb"], rss_start)
+            self._active.append(name)
+
+        try:
+            yield self
+        finally:
+            wall = time.perf_counter() - wall_start
+            rss_end = self.rss_mb()
+            cpu_end = self._thread_cpu()
+            names = _thread_names()
+
+            with self._lock:
+                self._active.remove(name)
+                entry["calls"] += 1
+                entry["duration_s"] += wall
+                entry["rss_end_mb"] = rss_end
+                entry["rss_peak_mb"] = max(entry["rss_peak_mb"], rss_end)
+                entry["rss_delta_mb"] += rss_end - rss_start
+                if fds_start is not None:
+                    entry["open_files_delta"] += self.process.num_fds() - fds_start
+                for tid, cpu in cpu_end.items():
+                    used = cpu - cpu_start.get(tid, 0.0)
+                    if used > 0:
+                        label = names.get(tid, str(tid))
+                        entry["thread_cpu_s"][label] = entry["thread_cpu_s"].get(label, 0.0) + used
+                entry["torch"] = _torch_memory()
+
+            if self.trace_allocations:
+                diff = tracemalloc.take_snapshot().compare_to(snapshot_start, "lineno")
+                merged = {a["location"]: a for a in entry["top_allocators"]}
+                for stat in diff[: self.top_allocators]:
+                    site = merged.setdefault(
+                        str(stat.traceback),
+                        {"location": str(stat.traceback), "size_diff_mb": 0.0, "count_diff": 0}
+                    )
+                    site["size_diff_mb"] += stat.size_diff / MB
+                    site["count_diff"] += stat.count_diff
+                entry["top_allocators"] = sorted(
+                    merged.values(), key=lambda a: -abs(a["size_diff_mb"])
+                )[: self.top_allocators]
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def phase(self, name: Optional[str]):
+        """
+        Tag the hot phase now running, or None between phases.
+
+        A plain attribute write, cheap enough to call per batch. The
+        background sampler (started by an enclosing ``stage()``) attributes
+        its RSS and CUDA tensor samples to the tagged phase, so peaks are
+        statistical: phases shorter than ``sample_interval`` may get none.
+
+        Args:
+            name: Phase name (e.g. "data_loading", "forward", "backward")
+        """
+        self._phase = name
+
+    def _timing_entry(self, name: str) -> dict:
+        return self.timings.setdefault(
+            name, {"calls": 0, "duration_s": 0.0, "samples": 0, "rss_peak_mb": 0.0}
+        )
+
+    def add_timing(self, name: str, seconds: float, calls: int = 1):
+        """
+        Record wall time measured by the caller, without any system calls.
+
+        Args:
+            name: Phase name (e.g. "data_loading", "forward", "backward")
+            seconds: Accumulated wall time
+            calls: Number of calls the time covers
+        """
+        with self._lock:
+            entry = self._timing_entry(name)
+            entry["calls"] += calls
+            entry["duration_s"] += seconds
+
+    # ------------------------------------------------------
+    # Soft memory budget
+    # ------------------------------------------------------
+    def over_budget(self, fraction: float = 1.0) -> bool:
+        """Whether RSS exceeds ``fraction`` of the soft memory budget."""
+        if self.memory_budget_mb is None:
+            return False
+        return self.rss_mb() > self.memory_budget_mb * fraction
+
+    def suggest_chunksize(
+        self, current: int, minimum: int = 1_000, maximum: Optional[int] = None
+    ) -> int:
+        """
+        Adapt a streaming chunk size to the soft memory budget.
+
+        Halves the chunk size above 90% of the budget and grows it by 25%
+        below 50%, so streaming stages back off instead of being OOM-killed.
+
+        Args:
+            current: Chunk size used for the previous chunk
+            minimum: Smallest chunk size allowed
+            maximum: Largest chunk size allowed (defaults to no limit)
+
+        Returns:
+            Chunk size to use for the next chunk
+        """
+        if self.memory_budget_mb is None:
+            return current
+        if self.over_budget(0.9):
+            suggested = max(minimum, current // 2)
+            if suggested != current:
+                self.logger.warning(
+                    f"RSS {self.rss_mb():.0f} MB near budget {self.memory_budget_mb:.0f} MB, "
+                    f"shrinking chunk size {current} → {suggested}"
+                )
+            return suggested
+        if not self.over_budget(0.5):
+            grown = int(current * 1.25)
+            return min(grown, maximum) if maximum else grown
+        return current
+
+    # ------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------
+    def report(self) -> dict:
+        """Return the per-run report as a dictionary."""
+        with self._lock:
+            stages = json.loads(json.dumps(self.stages))
+            timings = json.loads(json.dumps(self.timings))
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "memory_budget_mb": self.memory_budget_mb,
+            "rss_mb": self.rss_mb(),
+            "rss_peak_mb": max(
+                [self._peak_rss_mb, self.rss_mb()] + [s["rss_peak_mb"] for s in stages.values()]
+            ),
+            "stages": stages,
+            "timings": timings,
+        }
+
+    def save_report(self, path: str) -> Path:
+        """Write the report as JSON and return its path."""
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        self.logger.info(f"Resource report saved to {report_path}")
+        return report_path
+
+    def log_summary(self):
+        """Log one line per stage, largest peak RSS first, then the timed phases."""
+        report = self.report()
+        stages = sorted(report["stages"].items(), key=lambda item: -item[1]["rss_peak_mb"])
+        for name, entry in stages:
+            self.logger.info(
+                f"[{self.name}] {name}: peak {entry['rss_peak_mb']:.0f} MB, "
+                f"Δ {entry['rss_delta_mb']:+.0f} MB, "
+                f"{entry['duration_s']:.2f}s over {entry['calls']} call(s)"
+            )
+        for name, entry in report["timings"].items():
+            peak = f"sampled peak {entry['rss_peak_mb']:.0f} MB, " if entry["samples"] else ""
+            self.logger.info(
+                f"[{self.name}] {name}: {peak}"
+                f"{entry['duration_s']:.2f}s over {entry['calls']} call(s)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
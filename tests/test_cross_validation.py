@@ -0,0 +1,84 @@
+"""Tests for participant-grouped cross-validation."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.training.cross_validation import aggregate_metrics, participant_folds, run_cross_validation
+
+
+def make_config():
+    """Small configuration for fast training."""
+    return {
+        "data": {"batch_size": 8},
+        "model": {"encoder": {
+            "input_dim": 6, "hidden_dim": 8, "output_dim": 4, "num_layers": 2, "dropout": 0.0,
+        }},
+        "training": {"epochs": 2, "learning_rate": 0.01, "weight_decay": 0.0},
+    }
+
+
+class TestCrossValidation:
+    """Test suite for the cross-validation runner."""
+
+    def test_participant_folds_are_disjoint(self):
+        """Test that no participant appears in both train and validation."""
+        groups = np.repeat(np.arange(10), 4)
+        labels = np.repeat(np.arange(10) % 2, 4)
+        folds = participant_folds(groups, labels, n_splits=5)
+
+        assert len(folds) == 5
+        for fold in folds:
+            assert not set(groups[fold["train"]]) & set(groups[fold["val"]])
+
+    def test_participant_folds_stratified_and_seeded(self):
+        """Test that every fold keeps both classes and the seed changes the split."""
+        groups = np.repeat(np.arange(12), 3)
+        labels = np.repeat(np.arange(12) % 2, 3)
+
+        folds = participant_folds(groups, labels, n_splits=3, seed=0)
+        for fold in folds:
+            assert set(labels[fold["val"]]) == {0, 1}
+
+        other = participant_folds(groups, labels, n_splits=3, seed=1)
+        assert any(
+            set(a["val"]) != set(b["val"]) for a, b in zip(folds, other)
+        )
+
+    def test_aggregate_metrics(self):
+        """Test mean and confidence interval of fold metrics."""
+        folds = [{"val_loss": v, "accuracy": v, "auc": v} for v in (0.6, 0.7, 0.8)]
+        summary = aggregate_metrics(folds)
+
+        assert summary["accuracy"]["mean"] == pytest.approx(0.7)
+        assert summary["accuracy"]["ci_low"] < 0.7 < summary["accuracy"]["ci_high"]
+        assert summary["accuracy"]["n_folds"] == 3
+
+    def test_aggregate_metrics_counts_undefined_folds(self):
+        """Test that folds with an undefined metric are counted, not silently dropped."""
+        folds = [{"val_loss": 0.5, "accuracy": 0.5, "auc": v} for v in (0.6, float("nan"), 0.8)]
+        summary = aggregate_metrics(folds)
+
+        assert summary["auc"]["n_folds"] == 2
+        assert summary["auc"]["n_undefined"] == 1
+        assert summary["auc"]["mean"] == pytest.approx(0.7)
+
+    def test_run_cross_validation_parallel(self):
+        """Test parallel fold training and ensemble export."""
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            np.save(tmp / "x.npy", rng.normal(size=(48, 6)).astype(np.float32))
+            np.save(tmp / "y.npy", np.tile([0, 1], 24))
+            np.save(tmp / "g.npy", np.repeat(np.arange(6), 8))
+
+            results = run_cross_validation(
+                make_config(), tmp / "x.npy", tmp / "y.npy", tmp / "g.npy",
+                output_dir=str(tmp / "cv"), n_splits=3, n_jobs=2,
+            )
+
+            assert len(results["folds"]) == 3
+            assert Path(results["ensemble_path"]).exists()
+            assert "auc" in results["summary"]
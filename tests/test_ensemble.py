@@ -0,0 +1,54 @@
+"""Tests for the FoldEnsemble model."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+import torch
+
+from src.models.encoder import DummyEncoder
+from src.models.ensemble import FoldEnsemble
+
+
+def make_models(k=3):
+    """Independently initialized encoders with the same architecture."""
+    torch.manual_seed(0)
+    return [DummyEncoder(input_dim=16, hidden_dim=8, output_dim=4) for _ in range(k)]
+
+
+class TestFoldEnsemble:
+    """Test suite for FoldEnsemble."""
+
+    def test_forward_all_matches_separate_passes(self):
+        """Test that the batched pass equals k separate forward passes."""
+        models = make_models()
+        x = torch.randn(5, 16)
+        ensemble = FoldEnsemble(models)
+
+        with torch.no_grad():
+            expected = torch.stack([m(x) for m in models])
+            output = ensemble.forward_all(x)
+
+        assert output.shape == (3, 5, 4)
+        assert torch.allclose(output, expected, atol=1e-6)
+        assert torch.allclose(ensemble(x), expected.mean(dim=0), atol=1e-6)
+
+    def test_save_and_load(self):
+        """Test that a saved ensemble reproduces its outputs."""
+        ensemble = FoldEnsemble(make_models())
+        x = torch.randn(2, 16)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "ensemble.pt"
+            ensemble.save(path)
+            loaded = FoldEnsemble.load(
+                path, lambda: DummyEncoder(input_dim=16, hidden_dim=8, output_dim=4)
+            )
+
+        with torch.no_grad():
+            assert torch.allclose(ensemble(x), loaded(x), atol=1e-6)
+
+    def test_empty_ensemble(self):
+        """Test that an empty model list is rejected."""
+        with pytest.raises(ValueError):
+            FoldEnsemble([])
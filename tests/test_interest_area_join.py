@@ -0,0 +1,121 @@
+"""Tests for the fixation / interest-area join."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.interest_area_join import (
+    compute_reading_measures,
+    join_reading_measures,
+    map_fixations_to_interest_areas,
+)
+from src.data.onestop_loader import OneStopLoader
+
+
+def make_interest_areas(participants=("p1",), tops=(0, 0, 30, 30)):
+    """Two lines of two words each for a single paragraph."""
+    rows = []
+    for pid in participants:
+        boxes = [(0, 50, tops[0], 20), (50, 100, tops[1], 20),
+                 (0, 60, tops[2], 50), (60, 120, tops[3], 50)]
+        for ia_id, (left, right, top, bottom) in enumerate(boxes, start=1):
+            rows.append({
+                "participant_id": pid, "unique_paragraph_id": "par1", "IA_ID": ia_id,
+                "IA_LEFT": left, "IA_RIGHT": right, "IA_TOP": top, "IA_BOTTOM": bottom,
+            })
+    return pd.DataFrame(rows)
+
+
+def make_fixations(points, pid="p1"):
+    """Build a fixation report from (x, y, duration) tuples in reading order."""
+    return pd.DataFrame([
+        {"participant_id": pid, "unique_paragraph_id": "par1", "CURRENT_FIX_INDEX": i + 1,
+         "CURRENT_FIX_X": x, "CURRENT_FIX_Y": y, "CURRENT_FIX_DURATION": d}
+        for i, (x, y, d) in enumerate(points)
+    ])
+
+
+class TestInterestAreaJoin:
+    """Test suite for the interest-area join engine."""
+
+    def test_map_fixations(self):
+        """Test that fixations land in the right word box."""
+        fixations = make_fixations([
+            (10, 10, 100), (70, 5, 100), (30, 40, 100), (119, 49, 100),
+            (200, 10, 100), (10, 25, 100),
+        ])
+        mapped = map_fixations_to_interest_areas(fixations, make_interest_areas())
+
+        assert mapped.tolist() == [1, 2, 3, 4, -1, -1]
+
+    def test_map_fixations_ragged_tops(self):
+        """Test that boxes with slightly different tops still form one line."""
+        fixations = make_fixations([(10, 10, 100), (70, 1, 100), (30, 40, 100), (100, 31, 100)])
+        interest_areas = make_interest_areas(tops=(0, 1, 31, 29))
+        mapped = map_fixations_to_interest_areas(fixations, interest_areas)
+
+        assert mapped.tolist() == [1, 2, 3, 4]
+
+    def test_reading_measures(self):
+        """Test first-pass, total time, skips and regressions."""
+        # word 1 twice, skip word 2, word 3, regress to word 2, then word 1 again
+        fixations = make_fixations([
+            (10, 10, 100), (20, 10, 50), (30, 40, 200), (70, 10, 80), (10, 10, 40),
+        ])
+        measures = compute_reading_measures(fixations, make_interest_areas()).set_index("IA_ID")
+
+        assert measures.loc[1, "first_fixation_duration"] == 100
+        assert measures.loc[1, "gaze_duration"] == 150
+        assert measures.loc[1, "total_reading_time"] == 190
+        assert measures.loc[2, "skipped"]
+        assert np.isnan(measures.loc[2, "gaze_duration"])
+        assert measures.loc[2, "total_reading_time"] == 80
+        assert measures.loc[4, "skipped"]
+        assert measures.loc[4, "total_reading_time"] == 0
+        assert measures.loc[3, "regressions_out"] == 1
+        assert measures.loc[2, "regressions_in"] == 1
+        assert measures.loc[2, "regressions_out"] == 1
+        assert measures.loc[1, "regressions_in"] == 1
+
+    def test_partitioned_matches_single_pass(self):
+        """Test that participant partitioning gives the same result."""
+        interest_areas = make_interest_areas(("p1", "p2"))
+        fixations = pd.concat([
+            make_fixations([(10, 10, 100), (70, 10, 120)], pid="p1"),
+            make_fixations([(30, 40, 90), (10, 10, 60)], pid="p2"),
+        ], ignore_index=True)
+
+        expected = compute_reading_measures(fixations, interest_areas)
+        partitioned = join_reading_measures(fixations, interest_areas, n_jobs=2)
+
+        pd.testing.assert_frame_equal(
+            expected.sort_values(["participant_id", "IA_ID"]).reset_index(drop=True),
+            partitioned.sort_values(["participant_id", "IA_ID"]).reset_index(drop=True),
+        )
+
+    def test_loader_joins_streamed_blocks(self):
+        """Test that the loader's pooled per-block join matches a single pass."""
+        interest_areas = make_interest_areas(("p1", "p2", "p3"))
+        fixations = pd.concat([
+            make_fixations([(10, 10, 100), (70, 10, 120), (30, 40, 80)], pid="p1"),
+            make_fixations([(30, 40, 90), (10, 10, 60)], pid="p2"),
+            make_fixations([(119, 49, 70)], pid="p3"),
+        ], ignore_index=True)
+        expected = compute_reading_measures(fixations, interest_areas)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fixations_path = Path(tmpdir) / "fixations_Paragraph.csv"
+            ia_path = Path(tmpdir) / "ia_Paragraph.csv"
+            fixations.to_csv(fixations_path, index=False)
+            interest_areas.to_csv(ia_path, index=False)
+            loader = OneStopLoader(output_folder=tmpdir, chunksize=2, quality_checks=False)
+            measures = pd.read_csv(loader.build_word_measures(fixations_path, ia_path, n_jobs=2))
+
+        keys = ["participant_id", "IA_ID"]
+        pd.testing.assert_frame_equal(
+            expected.sort_values(keys).reset_index(drop=True),
+            measures.sort_values(keys).reset_index(drop=True),
+            check_dtype=False,
+        )
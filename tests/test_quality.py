@@ -0,0 +1,190 @@
+"""Tests for the fused data-quality checks."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.onestop_loader import OneStopLoader
+from src.data.quality import TrialQualityAccumulator, check_mat_file
+from src.data.zuco_loader import ZucoLoader
+
+
+def make_report():
+    """Two trials: one clean, one with track loss, off-screen samples and a long gap."""
+    return pd.DataFrame({
+        "participant_id": ["p1"] * 4 + ["p2"] * 4,
+        "unique_paragraph_id": [1] * 8,
+        "CURRENT_FIX_INDEX": [1, 2, 3, 4] * 2,
+        "CURRENT_FIX_X": [100, 200, 300, 400, np.nan, 2500, 300, 400],
+        "CURRENT_FIX_Y": [100] * 8,
+        "CURRENT_FIX_DURATION": [200] * 8,
+        "CURRENT_FIX_START": [0, 250, 500, 750, 0, 250, 5000, 5250],
+        "CURRENT_FIX_END": [200, 450, 700, 950, 200, 450, 5200, 5450],
+    })
+
+
+def make_accumulator():
+    """Accumulator configured for the OneStop column names."""
+    return TrialQualityAccumulator(
+        trial_cols=["participant_id", "unique_paragraph_id"],
+        x_col="CURRENT_FIX_X",
+        y_col="CURRENT_FIX_Y",
+        start_col="CURRENT_FIX_START",
+        end_col="CURRENT_FIX_END",
+    )
+
+
+class TestQualityChecks:
+    """Test suite for quality metrics and thresholds."""
+
+    def test_metrics_and_flags(self):
+        """Test per-trial metrics and exclusion reasons."""
+        accumulator = make_accumulator()
+        accumulator.update(make_report())
+        index = accumulator.finalize().set_index("participant_id")
+
+        assert index.loc["p1", "track_loss_ratio"] == 0
+        assert not index.loc["p1", "excluded"]
+        assert index.loc["p2", "track_loss_ratio"] == 0.25
+        assert index.loc["p2", "offscreen_ratio"] == 0.25
+        assert index.loc["p2", "max_gap"] == 4550
+        assert index.loc["p2", "excluded"]
+        assert index.loc["p2", "exclusion_reasons"] == "track_loss;offscreen;timestamp_gap"
+
+    def test_chunked_matches_single_pass(self):
+        """Test that chunk boundaries do not change the metrics."""
+        report = make_report()
+        single = make_accumulator()
+        single.update(report)
+
+        chunked = make_accumulator()
+        for start in range(0, len(report), 3):
+            chunked.update(report.iloc[start:start + 3])
+
+        pd.testing.assert_frame_equal(single.finalize(), chunked.finalize())
+
+    def test_thresholds_configurable(self):
+        """Test that relaxed thresholds keep the trial."""
+        accumulator = make_accumulator()
+        accumulator.update(make_report())
+        index = accumulator.finalize({
+            "max_track_loss_ratio": 0.5, "max_offscreen_ratio": 0.5, "max_gap": 10_000,
+        })
+
+        assert not index["excluded"].any()
+
+    def test_malformed_mat_file(self):
+        """Test that an unreadable .mat file is flagged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "broken.mat"
+            path.write_bytes(b"not an hdf5 file")
+            result = check_mat_file(path)
+
+        assert result["malformed"]
+        assert result["n_keys"] == 0
+
+    def test_loader_ingestion_writes_index(self):
+        """Test that chunked ingestion writes the metadata index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "fixations_Paragraph.csv"
+            make_report().to_csv(path, index=False, na_rep=".")
+            loader = OneStopLoader(output_folder=tmpdir, chunksize=3)
+            fixations, index = loader.ingest_fixations(path)
+
+            assert (Path(tmpdir) / "ordinary_trial_index.csv").exists()
+            assert index["excluded"].tolist() == [False, True]
+            # Flagged trial p2 is dropped during ingestion, unused columns are not parsed
+            assert fixations["participant_id"].astype(str).tolist() == ["p1"] * 4
+            assert "CURRENT_FIX_START" not in fixations.columns
+
+    def test_loader_streams_participant_blocks(self):
+        """Test that a sink receives one block per completed participant."""
+        report = pd.concat([make_report(), make_report().iloc[:4].assign(participant_id="p3")],
+                           ignore_index=True)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "fixations_Paragraph.csv"
+            report.to_csv(path, index=False, na_rep=".")
+            loader = OneStopLoader(output_folder=tmpdir, chunksize=3, exclude_flagged=False)
+            blocks = []
+            fixations, index = loader.ingest_fixations(path, sink=blocks.append)
+
+        assert fixations is None
+        assert index["participant_id"].tolist() == ["p1", "p2", "p3"]
+        assert sum(len(block) for block in blocks) == 12
+        for block in blocks:
+            assert block["participant_id"].nunique() == 1
+
+    @pytest.mark.parametrize("chunksize", [2, 3, 4, 100])
+    def test_loader_rejects_unsorted_participants(self, chunksize):
+        """Test that a participant reappearing after another raises whatever the chunk size."""
+        report = make_report()
+        unsorted = pd.concat(
+            [report.iloc[:2], report.iloc[4:], report.iloc[2:4]], ignore_index=True
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "fixations_Paragraph.csv"
+            unsorted.to_csv(path, index=False, na_rep=".")
+            loader = OneStopLoader(output_folder=tmpdir, chunksize=chunksize)
+            with pytest.raises(ValueError, match="'p1' are not contiguous"):
+                loader.ingest_fixations(path)
+
+    def test_flush_releases_completed_participants(self):
+        """Test that flushing per chunk marks excluded rows and keeps the index intact."""
+        report = make_report()
+        single = make_accumulator()
+        single.update(report)
+
+        streamed = make_accumulator()
+        masks = []
+        for start in range(0, len(report), 3):
+            streamed.update(report.iloc[start:start + 3])
+            masks.append(streamed.flush())
+        masks.append(streamed.flush(final=True))
+
+        # p1 is released once p2 starts; p2 (flagged) only at the end
+        assert [len(mask) for mask in masks] == [0, 4, 0, 4]
+        assert np.concatenate(masks).tolist() == [False] * 4 + [True] * 4
+        pd.testing.assert_frame_equal(single.finalize(), streamed.finalize())
+
+    def test_loader_joins_numeric_trial_keys(self):
+        """Test that numeric participant and paragraph ids still match the interest areas."""
+        report = make_report().assign(participant_id=[101] * 4 + [102] * 4)
+        interest_areas = pd.DataFrame([
+            {"participant_id": pid, "unique_paragraph_id": 1, "IA_ID": ia_id,
+             "IA_LEFT": left, "IA_RIGHT": left + 250, "IA_TOP": 0, "IA_BOTTOM": 200}
+            for pid in (101, 102) for ia_id, left in ((1, 0), (2, 250))
+        ])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fixations_path = Path(tmpdir) / "fixations_Paragraph.csv"
+            ia_path = Path(tmpdir) / "ia_Paragraph.csv"
+            report.to_csv(fixations_path, index=False, na_rep=".")
+            interest_areas.to_csv(ia_path, index=False)
+            loader = OneStopLoader(output_folder=tmpdir)
+            measures = pd.read_csv(loader.build_word_measures(fixations_path, ia_path, n_jobs=1))
+
+        # Participant 102 fails the quality checks and is dropped
+        assert measures["participant_id"].tolist() == [101, 101]
+        assert measures["total_reading_time"].tolist() == [400, 400]
+
+    def test_loader_from_config(self):
+        """Test that the data.quality config section reaches the loaders."""
+        config = {"data": {"raw_dir": "data/raw", "quality": {
+            "enabled": True, "exclude_flagged": False, "screen": [1024, 768],
+            "max_track_loss_ratio": 0.5, "max_gap": 10_000,
+        }}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            loader = OneStopLoader.from_config(config, output_folder=tmpdir)
+            path = Path(tmpdir) / "fixations_Paragraph.csv"
+            make_report().to_csv(path, index=False, na_rep=".")
+            _, index = loader.ingest_fixations(path)
+
+            config["data"]["quality"]["enabled"] = False
+            zuco = ZucoLoader.from_config(config, output_folder=tmpdir)
+
+        assert loader.screen == (1024, 768)
+        assert not loader.exclude_flagged
+        assert index.set_index("participant_id").loc["p2", "exclusion_reasons"] == "offscreen"
+        assert not zuco.quality_checks
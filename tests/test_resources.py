@@ -0,0 +1,115 @@
+"""Tests for the resource accounting utility."""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.resources import ResourceMonitor
+
+
+class TestResourceMonitor:
+    """Test suite for ResourceMonitor."""
+
+    def test_stage_accounting(self):
+        """Test that repeated stages accumulate into one entry."""
+        with ResourceMonitor(name="test", sample_interval=0.01) as monitor:
+            for _ in range(3):
+                with monitor.stage("preprocess"):
+                    data = bytearray(8 * 1024 * 1024)
+            del data
+            report = monitor.report()
+
+        stage = report["stages"]["preprocess"]
+        assert stage["calls"] == 3
+        assert stage["duration_s"] > 0
+        assert stage["rss_peak_mb"] >= stage["rss_start_mb"]
+        assert report["rss_peak_mb"] > 0
+
+    def test_trace_allocations(self):
+        """Test that tracemalloc top allocators are recorded."""
+        with ResourceMonitor(trace_allocations=True, top_allocators=3) as monitor:
+            with monitor.stage("load"):
+                data = [bytes(1024) for _ in range(1000)]
+            del data
+            report = monitor.report()
+
+        allocators = report["stages"]["load"]["top_allocators"]
+        assert 0 < len(allocators) <= 3
+        assert "test_resources.py" in allocators[0]["location"]
+
+    def test_allocators_accumulate_across_calls(self):
+        """Test that re-entering a stage sums allocation sites instead of overwriting them."""
+        kept = []
+        with ResourceMonitor(trace_allocations=True, top_allocators=3) as monitor:
+            for _ in range(2):
+                with monitor.stage("load"):
+                    kept.append(bytearray(1024 * 1024))
+            report = monitor.report()
+
+        top = report["stages"]["load"]["top_allocators"][0]
+        assert top["size_diff_mb"] >= 2
+        assert top["count_diff"] >= 2
+
+    def test_add_timing_and_config(self):
+        """Test caller-measured timings and the resources config section."""
+        config = {"resources": {
+            "memory_budget_mb": 512, "sample_interval": 0.1, "trace_allocations": True,
+        }}
+        with ResourceMonitor.from_config(config, name="fold_0") as monitor:
+            monitor.add_timing("forward", 0.5, calls=10)
+            monitor.add_timing("forward", 0.25, calls=5)
+            report = monitor.report()
+
+        assert monitor.memory_budget_mb == 512
+        assert monitor.sample_interval == 0.1
+        assert monitor.trace_allocations
+        assert report["run"] == "fold_0"
+        assert report["timings"]["forward"]["calls"] == 15
+        assert report["timings"]["forward"]["duration_s"] == 0.75
+
+    def test_phase_sampled_peaks(self):
+        """Test that the sampler attributes RSS peaks to the tagged phase."""
+        with ResourceMonitor(sample_interval=0.01) as monitor:
+            with monitor.stage("epoch"):
+                monitor.phase("forward")
+                time.sleep(0.1)
+                monitor.phase(None)
+            report = monitor.report()
+
+        forward = report["timings"]["forward"]
+        assert forward["samples"] > 0
+        assert forward["rss_peak_mb"] > 0
+        assert forward["calls"] == 0
+
+    def test_suggest_chunksize(self):
+        """Test that the chunk size shrinks over budget and grows back under it."""
+        with ResourceMonitor(memory_budget_mb=1) as monitor:
+            assert monitor.suggest_chunksize(10_000) == 5_000
+            assert monitor.suggest_chunksize(1_500, minimum=1_000) == 1_000
+
+        with ResourceMonitor(memory_budget_mb=1_000_000) as monitor:
+            assert monitor.suggest_chunksize(1_000, maximum=1_100) == 1_100
+
+        with ResourceMonitor() as monitor:
+            assert monitor.suggest_chunksize(1_000) == 1_000
+
+    def test_budget_from_environment(self, monkeypatch):
+        """Test that the budget falls back to the environment variable."""
+        monkeypatch.setenv("MEMORY_BUDGET_MB", "2048")
+        with ResourceMonitor() as monitor:
+            assert monitor.memory_budget_mb == 2048
+
+    def test_save_report(self):
+        """Test that the report is written as JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ResourceMonitor(name="run") as monitor:
+                with monitor.stage("download"):
+                    pass
+                path = monitor.save_report(Path(tmpdir) / "report.json")
+
+            with open(path) as f:
+                report = json.load(f)
+
+        assert report["run"] == "run"
+        assert "download" in report["stages"]